@@ -1,34 +1,86 @@
 #!/usr/bin/env python3
 
-from concurrent import futures
-import json
+import argparse
+import asyncio
 import logging
+import os
+import struct
 
 import grpc
-from google.protobuf.json_format import MessageToJson
+from google.protobuf import text_format
 
 from internalapi.sensor import sfa_iservice_pb2_grpc
 
 
+logger = logging.getLogger(__name__)
+
+# Report the amount of received messages every this many messages
+REPORT_INTERVAL = 10000
+
+
 class FileActivityServicer(sfa_iservice_pb2_grpc.FileActivityServiceServicer):
-    def Communicate(self, request_iterator, context):
-        for req in request_iterator:
-            print(MessageToJson(req))
+    def __init__(self, dump=None):
+        self.dump = dump
+        self.received = 0
+
+    async def Communicate(self, request_iterator, context):
+        async for req in request_iterator:
+            self.received += 1
 
+            # Rendering the message is expensive, only do it when the
+            # result is going to be seen.
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(text_format.MessageToString(req, as_one_line=True))
 
-def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+            if self.dump is not None:
+                # Length-prefixed binary messages, can be read back with
+                # FileActivity.FromString
+                self.dump.write(struct.pack('<I', req.ByteSize()))
+                self.dump.write(req.SerializeToString())
+
+            if self.received % REPORT_INTERVAL == 0:
+                logger.info(f'Received {self.received} messages')
+                if self.dump is not None:
+                    self.dump.flush()
+
+
+async def serve(dump=None):
+    # The asyncio server handles all streams on a single event loop, no
+    # need to hand every message over to a worker thread.
+    server = grpc.aio.server()
+    servicer = FileActivityServicer(dump)
     sfa_iservice_pb2_grpc.add_FileActivityServiceServicer_to_server(
-        FileActivityServicer(), server
+        servicer, server
     )
     server.add_insecure_port("0.0.0.0:9999")
-    server.start()
+    await server.start()
     try:
-        server.wait_for_termination()
+        await server.wait_for_termination()
+    except asyncio.CancelledError:
+        await server.stop(5)
+
+    logger.info(f'Received {servicer.received} messages in total')
+
+
+def main(args):
+    logging.basicConfig(level=os.environ.get('LOGLEVEL', 'INFO').upper())
+
+    try:
+        if args.dump_file is None:
+            asyncio.run(serve())
+            return
+
+        with open(args.dump_file, 'wb') as dump:
+            asyncio.run(serve(dump))
     except KeyboardInterrupt:
-        server.stop(5)
+        pass
 
 
 if __name__ == '__main__':
-    logging.basicConfig()
-    serve()
+    parser = argparse.ArgumentParser(prog='mock-server')
+    parser.add_argument('--dump-file', required=False,
+        help='File to store received messages in binary form')
+
+    args = parser.parse_args()
+
+    main(args)
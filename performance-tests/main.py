@@ -3,8 +3,10 @@ from datetime import datetime, UTC
 from enum import Enum
 import json
 import logging
-from multiprocessing import Process
+import mmap
+from multiprocessing import Array, Process, Value
 import os
+import re
 import shlex
 import signal
 import subprocess
@@ -13,6 +15,30 @@ import time
 
 logger = logging.getLogger(__name__)
 
+# Heap usage snapshots in the massif output file
+MASSIF_HEAP_RE = re.compile(rb'^mem_heap_B=(\d+)', re.MULTILINE)
+
+# Version line in the fact startup logs
+FACT_VERSION_RE = re.compile(rb'fact version:\s+(\S+)')
+
+# Monitoring tools wrapping fact to collect user space metrics
+PERF_ARGV = (
+    'perf', 'stat',
+    '-D', '5',
+    '-j',
+    '-e', 'task-clock',
+    '-o', 'output.json',
+    '--',
+)
+VALGRIND_ARGV = (
+    'valgrind',
+    '--tool=massif',
+    '--massif-out-file=output.data',
+)
+
+# Extra room for monitor samples on top of one per second of the test
+MONITOR_SAMPLES_SLACK = 10
+
 
 # Metrics to be collected during the test
 class Metric(Enum):
@@ -41,76 +67,128 @@ class Workload(Enum):
     IGNORED = 'ignored'
 
 
-def start_monitoring(args):
-    def extract_cpu_usage(output):
-        logger.debug("Extract CPU {}".format(output))
+def bpf_fdinfo(pid):
+    """
+    Parse the fdinfo of every bpf program or map descriptor held by the
+    process, yielding one dictionary per descriptor.
+    """
+    fdinfo_dir = f'/proc/{pid}/fdinfo'
+    try:
+        fds = os.listdir(fdinfo_dir)
+    except FileNotFoundError:
+        # The process is gone
+        return
+
+    for fd in fds:
+        try:
+            with open(f'{fdinfo_dir}/{fd}', 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            # The descriptor was closed in the meantime
+            continue
+
+        info = {}
+        for line in content.splitlines():
+            key, _, value = line.partition(b':')
+            info[key] = value.strip()
+
+        if b'prog_type' in info or b'map_type' in info:
+            yield info
+
+
+def start_monitoring(args, fact_pid, samples, count):
+    """
+    The kernel exposes runtime statistics for bpf programs and the memory
+    used by bpf maps in the fdinfo of descriptors referring to them. Sample
+    those straight from the descriptors fact holds, instead of spawning
+    bpftool on every tick.
+    """
+    prog_id = None
+
+    def find_prog_id(name):
+        argv = ['bpftool', 'prog', 'show', 'name', name, '--json']
+
+        logger.debug(f'Starting a process: {argv}')
+        p = subprocess.run(argv, capture_output=True, check=False)
+
+        if not p.stdout:
+            logger.debug("Could not find program {}: {}".format(name, p.stderr))
+            return None
+
+        return json.loads(p.stdout)['id']
+
+    def extract_cpu_usage():
+        nonlocal prog_id
 
-        data = json.loads(output)
-        return data['run_time_ns'] / data['run_cnt']
+        # Program ids are only known once fact has loaded them
+        if prog_id is None:
+            prog_id = find_prog_id('trace_file_open')
+            if prog_id is None:
+                return None
 
-    # identify if the bpf map, as returned by bpftool, belongs to fact
-    def fact_map(data):
-        logger.debug("Filter {}".format(data))
+        for info in bpf_fdinfo(fact_pid):
+            if info.get(b'prog_id') != str(prog_id).encode():
+                continue
 
-        if 'pids' not in data:
-            return False
+            run_cnt = int(info[b'run_cnt'])
+            if run_cnt == 0:
+                return None
 
-        return any((True
-            for c in data['pids']
-            if c['comm'] == 'fact'
-        ))
+            return int(info[b'run_time_ns']) / run_cnt
 
-    def extract_memory_usage(output):
-        logger.debug("Extract Memory {}".format(output))
+        return None
 
-        data = json.loads(output)
-        fact_maps = filter(fact_map, data)
-        return sum(m['bytes_memlock'] for m in fact_maps)
+    def extract_memory_usage():
+        # The same map can be referenced by multiple descriptors
+        maps = {
+            info.get(b'map_id', i): int(info[b'memlock'])
+            for i, info in enumerate(bpf_fdinfo(fact_pid))
+            if b'map_type' in info
+        }
+        return sum(maps.values())
 
     match args.metric:
         case Metric.KERNEL_SPACE_CPU:
-            args_str = 'bpftool prog show name {} --json'.format(
-                'trace_file_open'
-            )
-            proc_fn = extract_cpu_usage
+            sample_fn = extract_cpu_usage
 
         case Metric.KERNEL_SPACE_MEM:
-            args_str = 'bpftool map --json'
-            proc_fn = extract_memory_usage
+            sample_fn = extract_memory_usage
 
         case Metric.USER_SPACE_CPU | Metric.USER_SPACE_MEM:
             # Monitoring for userspace is done via launching fact under the
             # monitoring tool, e.g. perf or valgrind. Hence it's noop here.
             return
 
-    process_args = shlex.split(args_str)
+    # Schedule samples against absolute ticks, so the time spent
+    # taking a sample doesn't accumulate as drift.
+    next_tick = time.monotonic()
 
     while True:
-        logger.debug(f'Starting a process: {args_str}')
-        p = subprocess.Popen(process_args, stdout=subprocess.PIPE)
-        output, errors = p.communicate()
+        next_tick += 1.0
 
-        if errors:
-            logger.debug("Could not spin monitor: {}".format(errors))
+        value = sample_fn()
+        if value is not None:
+            logger.debug("Monitor results: {}".format(value))
 
-        if not output:
-            continue
-
-        logger.debug("Monitor results: {}".format(output))
-
-        with open('{}.data'.format(args.metric.value), 'a') as data:
-            data.write("{}\n".format(proc_fn(output)))
+            # Store the sample before publishing it via the counter, so the
+            # main process never reads a half written slot.
+            if count.value < len(samples):
+                samples[count.value] = value
+                count.value += 1
+            else:
+                logger.warning('No space left for monitor samples')
 
-        time.sleep(1)
+        time.sleep(max(0, next_tick - time.monotonic()))
 
 
 def start_berserker(args):
-    args_str = 'berserker -f {}/{}.ber'.format(
-        args.workloads_path,
-        args.workload.value
-    )
-    args = shlex.split(args_str)
-    return subprocess.Popen(args)
+    argv = [
+        'berserker',
+        '-f', '{}/{}.ber'.format(args.workloads_path, args.workload.value),
+    ]
+
+    logger.debug(f'Starting a process: {argv}')
+    return subprocess.Popen(argv, close_fds=False)
 
 
 def start_fact(args):
@@ -119,9 +197,14 @@ def start_fact(args):
     perf or valgrind.
     """
     def stop_perf(proc):
-        # Somehow SIGINT is not propagated to perf, so just brutally stop fact to
-        # trigger output.
-        subprocess.Popen(['pkill', 'fact'])
+        # Somehow SIGINT is not propagated to perf, so signal fact directly to
+        # trigger output. perf runs fact as its direct child, no need to go
+        # looking for it by name.
+        with open(f'/proc/{proc.pid}/task/{proc.pid}/children') as f:
+            children = [int(pid) for pid in f.read().split()]
+
+        for pid in children:
+            os.kill(pid, signal.SIGINT)
 
         # Give it a moment to write the data. Perf will exit after the payload
         # process has finished.
@@ -135,33 +218,28 @@ def start_fact(args):
         proc.terminate()
         proc.wait()
 
+    fact_argv = ['fact', *shlex.split(args.fact_cmdline or '')]
+
     match args.metric:
         case Metric.USER_SPACE_CPU:
-            args_str = 'perf stat -D {} -j -e {} -o {} -- fact {}'.format(
-                5,
-                'task-clock',
-                'output.json',
-                args.fact_cmdline
-            )
+            argv = [*PERF_ARGV, *fact_argv]
             stop_fn = stop_perf
 
         case Metric.USER_SPACE_MEM:
-            args_str = 'valgrind --tool=massif --massif-out-file={} fact {}'.format(
-                'output.data',
-                args.fact_cmdline
-            )
+            argv = [*VALGRIND_ARGV, *fact_argv]
             stop_fn = stop_valgrind
 
         case Metric.KERNEL_SPACE_CPU | Metric.KERNEL_SPACE_MEM:
             # Monitoring for kernel space is done via launching a monitoring
             # tool in parallel with fact. Hence it's noop here.
-            args_str = 'fact {}'.format(args.fact_cmdline)
+            argv = fact_argv
             stop_fn = stop_fact
 
-    logger.debug(f'Starting a process: {args_str}')
-    args = shlex.split(args_str)
+    logger.debug(f'Starting a process: {argv}')
 
-    return subprocess.Popen(args, stdout=subprocess.DEVNULL), stop_fn
+    return subprocess.Popen(argv,
+        stdout=subprocess.DEVNULL,
+        close_fds=False), stop_fn
 
 
 def get_version(args):
@@ -179,101 +257,52 @@ def get_version(args):
     output, errors = fact.communicate()
 
     logger.debug(f'Output of version command, {output}, {errors}')
-    def version(line):
-        if len(line) <= 3:
-            return False
-
-        return line[2] == b'fact' and line[3] == b'version:'
-
-    def split(line):
-        return line.split()
 
-    output_list = map(split, errors.split(b'\n'))
+    version = FACT_VERSION_RE.search(errors)
+    if version is None:
+        logger.error(f'No version line found, {errors}')
+        return b''
 
-    # filter will return a nested array, so unwrap it with next
-    version_line = next(filter(version, output_list))
+    return version.group(1)
 
-    if len(list(version_line)) <= 4:
-        logger.error(f'No version line found, {output}')
-        return ''
 
-    return version_line[4]
-
-
-def process_results(args):
-    fact_version = get_version(args).decode('utf-8')
+def process_results(args, samples):
+    result = {
+        'metric': args.metric.value,
+        'workload': args.workload.value,
+        'duration': args.duration,
+        'timestamp': datetime.now(UTC).isoformat(),
+        'version': get_version(args).decode('utf-8'),
+    }
 
     match args.metric:
         case Metric.USER_SPACE_CPU:
-            output = json.load(open('output.json', 'r'))
-
-            return json.dumps([{
-                'metric': args.metric.value,
-                'workload': args.workload.value,
-                'duration': args.duration,
-                'timestamp': datetime.now(UTC).isoformat(),
-                'value': output['metric-value'],
-                'unit': output['metric-unit'],
-                'version': fact_version,
-            }])
-
-        case Metric.USER_SPACE_MEM:
-            def heap(line):
-                return line.startswith('mem_heap_B')
-
-            def get_heap_value(line):
-                return int(line.split(sep='=')[1])
+            with open('output.json', 'rb') as f:
+                output = json.load(f)
 
-            heap_lines = filter(heap, open('output.data', 'r'))
-            heap_values = list(map(get_heap_value, heap_lines))
+            result['value'] = output['metric-value']
+            result['unit'] = output['metric-unit']
 
-            timestamp = datetime.now(UTC).isoformat()
+        case Metric.USER_SPACE_MEM:
+            # massif output can get large on long runs, scan it with a
+            # single regex over the mapped file instead of line by line.
+            with open('output.data', 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as mm:
+                result['value'] = [
+                    int(m.group(1)) for m in MASSIF_HEAP_RE.finditer(mm)
+                ]
 
-            return json.dumps([{
-                'metric': args.metric.value,
-                'workload': args.workload.value,
-                'duration': args.duration,
-                'timestamp': timestamp,
-                'value': heap_values,
-                'unit': 'bytes',
-                'version': fact_version,
-            }])
+            result['unit'] = 'bytes'
 
         case Metric.KERNEL_SPACE_CPU:
-            def convert(line):
-                return float(line)
-
-            data = open('{}.data'.format(args.metric.value), 'r')
-            values = list(map(convert, data))
-            timestamp = datetime.now(UTC).isoformat()
-
-            return json.dumps([{
-                'metric': args.metric.value,
-                'workload': args.workload.value,
-                'duration': args.duration,
-                'timestamp': timestamp,
-                'value': values,
-                'unit': 'CPU utilization',
-                'version': fact_version,
-            }])
+            result['value'] = list(samples)
+            result['unit'] = 'CPU utilization'
 
         case Metric.KERNEL_SPACE_MEM:
-            def convert(line):
-                return int(line)
-
-            data = open('{}.data'.format(args.metric.value), 'r')
-            values = list(map(convert, data))
-            timestamp = datetime.now(UTC).isoformat()
+            result['value'] = [int(v) for v in samples]
+            result['unit'] = 'bytes'
 
-            return json.dumps([{
-                'metric': args.metric.value,
-                'workload': args.workload.value,
-                'duration': args.duration,
-                'timestamp': timestamp,
-                'value': values,
-                'unit': 'bytes',
-                'version': fact_version,
-            }])
+    return json.dumps([result])
 
 
 def main(args):
@@ -281,7 +310,15 @@ def main(args):
 
     fact, stop_fn = start_fact(args)
     berserker = start_berserker(args)
-    monitor = Process(target=start_monitoring, args=(args,))
+
+    # Samples collected by the monitor are handed over via shared memory,
+    # at 1Hz there can't be more of them than seconds the test runs for.
+    samples = Array('d', args.duration + MONITOR_SAMPLES_SLACK, lock=False)
+    count = Value('i', 0, lock=False)
+    monitor = Process(
+        target=start_monitoring,
+        args=(args, fact.pid, samples, count)
+    )
     monitor.start()
 
     time.sleep(args.duration)
@@ -293,7 +330,7 @@ def main(args):
 
     with open(args.output_file, 'w') as f:
         logger.debug(f'Writing results to {args.output_file}')
-        f.write(process_results(args))
+        f.write(process_results(args, samples[:count.value]))
 
     if not args.keep_traces:
         for trace in ('output.json', 'output.data'):
@@ -5,6 +5,7 @@ import uuid
 import numpy as np
 
 from opensearchpy import OpenSearch
+from opensearchpy.helpers import bulk
 
 
 def main(args):
@@ -28,46 +29,48 @@ def main(args):
         ssl_show_warn=False,
     )
 
-    with open(args.result, 'r') as f:
-        documents = json.load(f)
+    # Results of several runs are stored together, sharing the connection
+    # and the bulk request.
+    documents = []
+    for result in args.result:
+        with open(result, 'r') as f:
+            documents.extend(json.load(f))
 
-        for document in documents:
-            if type(document['value']) is list:
-                values = document['value']
-                d = document.copy()
+    def action(document):
+        return {
+            '_index': args.index,
+            '_id': str(uuid.uuid4()),
+            '_source': document,
+        }
 
-                d['value'] = np.percentile(values, 90).item()
-                d['unit'] = "{}, 90p".format(document['unit'])
+    actions = []
+    for document in documents:
+        if type(document['value']) is list:
+            # Calculate both percentiles in one pass over the values
+            p90, p50 = np.percentile(np.asarray(document['value']), [90, 50])
+            d = document.copy()
 
-                response = client.index(
-                    index = args.index,
-                    body = d,
-                    id = uuid.uuid4(),
-                    refresh = True
-                )
+            d['value'] = p90.item()
+            d['unit'] = "{}, 90p".format(document['unit'])
+            actions.append(action(d))
 
-                d['value'] = np.percentile(values, 50).item()
-                d['unit'] = "{}, median".format(document['unit'])
+            d = document.copy()
+            d['value'] = p50.item()
+            d['unit'] = "{}, median".format(document['unit'])
+            actions.append(action(d))
 
-                response = client.index(
-                    index = args.index,
-                    body = d,
-                    id = uuid.uuid4(),
-                    refresh = True
-                )
+        else:
+            actions.append(action(document))
 
-            else:
-                response = client.index(
-                    index = args.index,
-                    body = document,
-                    id = uuid.uuid4(),
-                    refresh = True
-                )
+    # Send everything in one go. No need to force a refresh, the results are
+    # only looked at from dashboards, well after the index refreshes itself.
+    bulk(client, actions, chunk_size=500)
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(prog='store')
-    parser.add_argument('result', help='Path to the data file to store')
+    parser.add_argument('result', nargs='+',
+        help='Path to the data files to store')
     parser.add_argument('index', help='OpenSearch index to store the data')
 
     args = parser.parse_args()
@@ -1,17 +1,18 @@
 from __future__ import annotations
 
+import fcntl
 import json
 import os
-from shutil import rmtree
-from tempfile import NamedTemporaryFile, mkdtemp
-from time import sleep
+from concurrent import futures
+from shutil import copyfile
+from tempfile import NamedTemporaryFile, gettempdir
+from time import monotonic, sleep
 
 import docker
 import docker.errors
 import docker.models.containers
 import pytest
 import requests
-import yaml
 
 from server import EventServer, GrpcServer, OtlpServer
 
@@ -20,14 +21,12 @@ pytest_plugins = ['test_editors.commons']
 
 
 @pytest.fixture
-def monitored_dir():
+def monitored_dir(tmp_path_factory: pytest.TempPathFactory):
     """
-    Create a temporary directory for tests and clean it up afterwards.
+    Create a temporary directory for tests. pytest keeps the directories
+    of the last few sessions around and removes older ones.
     """
-    cwd = os.getcwd()
-    tmp = mkdtemp(prefix='fact-test-', dir=cwd)
-    yield tmp
-    rmtree(tmp)
+    return str(tmp_path_factory.mktemp('monitored'))
 
 
 @pytest.fixture
@@ -45,15 +44,12 @@ def test_file(monitored_dir: str):
 
 
 @pytest.fixture
-def ignored_dir():
+def ignored_dir(tmp_path_factory: pytest.TempPathFactory):
     """
     Create a temporary directory for tests that will not be monitored
-    by fact. After tests are done, the directory is cleaned up.
+    by fact. pytest takes care of cleaning it up in later sessions.
     """
-    cwd = os.getcwd()
-    tmp = mkdtemp(prefix='fact-test-', dir=cwd)
-    yield tmp
-    rmtree(tmp)
+    return str(tmp_path_factory.mktemp('ignored'))
 
 
 @pytest.fixture(scope='session', autouse=True)
@@ -68,6 +64,16 @@ def docker_client():
     return docker.from_env()
 
 
+@pytest.fixture(scope='session')
+def http_session():
+    """
+    HTTP session for querying the fact endpoints, reusing connections
+    across requests.
+    """
+    with requests.Session() as session:
+        yield session
+
+
 def _get_output_modes(config: pytest.Config) -> list[str]:
     output = config.getoption('--output')
     assert isinstance(output, str)
@@ -82,8 +88,18 @@ def pytest_generate_tests(metafunc: pytest.Metafunc):
         metafunc.parametrize('server', modes, indirect=True)
 
 
+@pytest.fixture(scope='session')
+def executor():
+    """
+    Thread pool shared by all event servers for waiting on events.
+    """
+    ex = futures.ThreadPoolExecutor(max_workers=2)
+    yield ex
+    ex.shutdown(wait=False, cancel_futures=True)
+
+
 @pytest.fixture
-def server(request: pytest.FixtureRequest):
+def server(request: pytest.FixtureRequest, executor: futures.Executor):
     """
     Start and stop an event server.
 
@@ -93,9 +109,9 @@ def server(request: pytest.FixtureRequest):
     """
     mode = request.param
     if mode == 'otlp':
-        s: EventServer = OtlpServer()
+        s: EventServer = OtlpServer(executor)
     else:
-        s = GrpcServer()
+        s = GrpcServer(executor)
     s.serve()
     yield s
     s.stop()
@@ -120,27 +136,34 @@ def get_image(
 ):
     image = request.config.getoption('--image')
     assert isinstance(image, str)
-    try:
-        docker_client.images.get(image)
-    except docker.errors.ImageNotFound:
-        docker_client.images.pull(image)
+
+    # When running with multiple pytest workers, make sure only one of
+    # them pulls the image, the rest will find it locally.
+    lock_file = os.path.join(gettempdir(), 'fact-image.lock')
+    with open(lock_file, 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            docker_client.images.get(image)
+        except docker.errors.ImageNotFound:
+            docker_client.images.pull(image)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
 
 
 def dump_logs(container: docker.models.containers.Container, file: str):
-    logs = container.logs().decode('utf-8')
-    with open(file, 'w') as f:
-        f.write(logs)
+    # Write the logs as they are read, without holding all of them in memory
+    with open(file, 'wb') as f:
+        for chunk in container.logs(stream=True, follow=False):
+            f.write(chunk)
 
 
 def dump_container_inspect(
-    client: docker.DockerClient,
     container: docker.models.containers.Container,
     file: str,
 ):
-    assert container.id is not None
-    container_inspect = client.api.inspect_container(container.id)
+    # The container attributes hold the inspect output from the last reload
     with open(file, 'w') as f:
-        json.dump(container_inspect, f, indent=2)
+        json.dump(container.attrs, f, indent=2)
 
 
 @pytest.fixture
@@ -178,14 +201,13 @@ def fact_config(
         dir=cwd,
         mode='w',
     )
-    yaml.dump(config, config_file)
+    # JSON is valid YAML and much cheaper to emit. Unlike yaml.dump,
+    # json.dump doesn't flush the stream, so do it before fact reads it.
+    json.dump(config, config_file)
+    config_file.flush()
 
     yield config, config_file.name
-    with (
-        open(os.path.join(logs_dir, 'fact.yml'), 'w') as f,
-        open(config_file.name) as r,
-    ):
-        f.write(r.read())
+    copyfile(config_file.name, os.path.join(logs_dir, 'fact.yml'))
     config_file.close()
 
 
@@ -214,12 +236,17 @@ def test_container(
             },
         },
         name='fedora',
+        # Docker creates a missing working directory in the container's
+        # rootfs on creation, so /container-dir lives on the overlayfs
+        # without having to exec a mkdir in the container.
+        working_dir='/container-dir',
     )
-    container.exec_run('mkdir /container-dir')
 
     yield container
 
-    container.stop(timeout=1)
+    # The shell running as pid 1 ignores SIGTERM, stopping the container
+    # would only wait out the timeout before killing it anyway.
+    container.kill()
     container.remove()
 
 
@@ -231,6 +258,7 @@ def fact(
     server: EventServer,
     logs_dir: str,
     test_file: str,
+    http_session: requests.Session,
 ):
     """
     Run the fact docker container for integration tests.
@@ -265,17 +293,20 @@ def fact(
     )
 
     container_log = os.path.join(logs_dir, 'fact.log')
-    # Wait for container to be ready
-    for _ in range(10):
+    # Wait for container to be ready, fact usually comes up quickly so
+    # poll often at first and back off exponentially.
+    health_check = f'http://{config["endpoint"]["address"]}/health_check'
+    deadline = monotonic() + 10
+    delay = 0.01
+    while monotonic() < deadline:
         try:
-            resp = requests.get(
-                f'http://{config["endpoint"]["address"]}/health_check'
-            )
+            resp = http_session.get(health_check, timeout=1)
             if resp.status_code == 200:
                 break
-        except (requests.RequestException, requests.ConnectionError) as e:
+        except requests.RequestException as e:
             print(e)
-        sleep(1)
+        sleep(delay)
+        delay = min(delay * 2, 1)
     else:
         container.stop(timeout=1)
         dump_logs(container, container_log)
@@ -287,21 +318,27 @@ def fact(
     # Capture prometheus metrics before stopping the container
     if config['endpoint']['expose_metrics']:
         metric_log = os.path.join(logs_dir, 'metrics')
-        resp = requests.get(f'http://{config["endpoint"]["address"]}/metrics')
-        if resp.status_code == 200:
-            with open(metric_log, 'w') as f:
-                f.write(resp.text)
+        with http_session.get(
+            f'http://{config["endpoint"]["address"]}/metrics',
+            stream=True,
+        ) as resp:
+            if resp.status_code == 200:
+                with open(metric_log, 'wb') as f:
+                    for chunk in resp.iter_content(chunk_size=65536):
+                        f.write(chunk)
 
+    # stop only returns once the container has exited, a single inspect
+    # afterwards gets both the exit code and the data to archive.
     container.stop(timeout=5)
-    exit_status = container.wait(timeout=2)
+    container.reload()
     try:
         dump_logs(container, container_log)
         dump_container_inspect(
-            docker_client, container, os.path.join(logs_dir, 'container.json')
+            container, os.path.join(logs_dir, 'container.json')
         )
     finally:
         container.remove()
-    assert exit_status['StatusCode'] == 0
+    assert container.attrs['State']['ExitCode'] == 0
 
 
 def pytest_addoption(parser: pytest.Parser):
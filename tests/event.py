@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import functools
 import os
-import string
+import re
+import sys
 from enum import Enum
 from re import Pattern
 from typing import Any
@@ -16,23 +18,41 @@ except ImportError:
 
 import utils
 
+# A container id is made of 64 hex digits at the very end of the cgroup
+CONTAINER_ID_RE = re.compile(r'[/-]([0-9a-fA-F]{64})\Z')
+
+
+def read_proc_file(path: str, size: int = 4096) -> bytes:
+    """
+    Read up to size bytes from a procfs file.
+
+    procfs files are small and generated on read, so a single unbuffered
+    read avoids setting up a buffered file object for each of them.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def intern_path(path: Any) -> Any:
+    """
+    Intern plain string paths, leaving patterns and None untouched.
+
+    Expected and received events then share the same path objects and
+    comparing them short-circuits on identity.
+    """
+    return sys.intern(path) if isinstance(path, str) else path
+
 
 def extract_container_id(cgroup: str) -> str:
     if (scope_idx := cgroup.rfind('.scope')) != -1:
         cgroup = cgroup[:scope_idx]
 
-    if not cgroup or len(cgroup) < 65:
-        return ''
-
-    cgroup = cgroup[-65:]
-    if cgroup[0] not in ['/', '-']:
-        return ''
-
-    cgroup = cgroup[1:]
-    if all(c in string.hexdigits for c in cgroup):
-        return cgroup[:12]
-    else:
+    if (m := CONTAINER_ID_RE.search(cgroup)) is None:
         return ''
+    return m.group(1)[:12]
 
 
 class EventType(Enum):
@@ -61,12 +81,56 @@ ACL_TAG_GROUP = 4
 ACL_TAG_MASK = 5
 ACL_TAG_OTHER = 6
 
+# Fields compared by Process.diff as (name, attribute) pairs, cheapest
+# comparisons first. The pid is handled on its own, since it is optional.
+PROCESS_DIFF_FIELDS: tuple[tuple[str, str], ...] = (
+    ('uid', '_uid'),
+    ('gid', '_gid'),
+    ('loginuid', '_loginuid'),
+    ('name', '_name'),
+    ('container_id', '_container_id'),
+    ('exe_path', '_exe_path'),
+    ('args', '_args'),
+)
+
+# Event type specific fields compared by Event.diff as (name, attribute)
+# pairs.
+EVENT_DIFF_FIELDS: dict[EventType, tuple[tuple[str, str], ...]] = {
+    EventType.PERMISSION: (('mode', '_mode'),),
+    EventType.OWNERSHIP: (
+        ('owner_uid', '_owner_uid'),
+        ('owner_gid', '_owner_gid'),
+    ),
+    EventType.XATTR_SET: (('xattr_name', '_xattr_name'),),
+    EventType.XATTR_REMOVE: (('xattr_name', '_xattr_name'),),
+    EventType.ACL: (('acl_type', '_acl_type'),),
+}
+
+# Format strings for the __str__ implementations, compiled once instead
+# of building an f-string field by field.
+PROCESS_FMT = (
+    'Process(uid=%d, gid=%d, pid=%s, exe_path=%s, args=%s, name=%s, '
+    'container_id=%s, loginuid=%d)'
+)
+EVENT_FMT = 'Event(event_type=%s, process=%s, file="%s", host_path="%s"'
+
 
 class Process:
     """
     Represents a process with its attributes.
     """
 
+    __slots__ = (
+        '_args',
+        '_container_id',
+        '_exe_path',
+        '_gid',
+        '_loginuid',
+        '_name',
+        '_pid',
+        '_uid',
+    )
+
     def __init__(
         self,
         pid: int | None,
@@ -81,51 +145,71 @@ class Process:
         self._pid: int | None = pid
         self._uid: int = uid
         self._gid: int = gid
-        self._exe_path: str = exe_path
+        # These strings repeat across most processes in a test, interning
+        # them lets comparisons short-circuit on identity.
+        self._exe_path: str = sys.intern(exe_path)
         self._args: str = args
-        self._name: str = name
-        self._container_id: str = container_id
+        self._name: str = sys.intern(name)
+        self._container_id: str = sys.intern(container_id)
         self._loginuid: int = loginuid
 
     @classmethod
     def from_proc(cls, pid: int | None = None):
-        pid = pid if pid is not None else os.getpid()
-        proc_dir = os.path.join('/proc', str(pid))
-
-        uid = 0
-        gid = 0
-        with open(os.path.join(proc_dir, 'status')) as f:
+        """
+        Build a Process from the procfs entries of pid, defaulting to the
+        current process.
 
-            def get_id(line: str, wanted_id: str) -> int | None:
-                if line.startswith(f'{wanted_id}:'):
-                    parts = line.split()
-                    if len(parts) > 2:
-                        return int(parts[1])
-                return None
+        The current process doesn't change for the duration of the tests,
+        so it is only read once. Other pids may be reused and are always
+        read from procfs.
+        """
+        self_pid = os.getpid()
+        if pid is None or pid == self_pid:
+            return Process._from_self(self_pid)
+        return Process._read_proc(pid)
 
-            for line in f.readlines():
-                if (id := get_id(line, 'Uid')) is not None:
-                    uid = id
-                elif (id := get_id(line, 'Gid')) is not None:
-                    gid = id
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _from_self(pid: int) -> Process:
+        # Keyed on the pid so forked children don't get their parent
+        return Process._read_proc(pid)
 
-        exe_path = os.path.realpath(os.path.join(proc_dir, 'exe'))
+    @staticmethod
+    def _read_proc(pid: int) -> Process:
+        proc_dir = f'/proc/{pid}'
 
-        with open(os.path.join(proc_dir, 'cmdline'), 'rb') as f:
-            content = f.read(4096)
-            args = [
-                arg.decode('utf-8') for arg in content.split(b'\x00') if arg
-            ]
-        args = utils.rust_style_join(args)
+        uid = 0
+        gid = 0
+        status = read_proc_file(f'{proc_dir}/status')
+        # Gid immediately follows Uid, stop parsing once both are found
+        for line in status.splitlines():
+            if not line.startswith((b'Uid:', b'Gid:')):
+                continue
+
+            parts = line.split()
+            if len(parts) > 2:
+                if parts[0] == b'Uid:':
+                    uid = int(parts[1])
+                else:
+                    gid = int(parts[1])
+                    break
+
+        # The kernel already resolves the exe link to a canonical path
+        exe_path = os.readlink(f'{proc_dir}/exe')
+
+        content = read_proc_file(f'{proc_dir}/cmdline')
+        # Decode once and split the str, rather than decoding every arg
+        args = utils.rust_style_join(
+            [arg for arg in content.decode('utf-8').split('\x00') if arg]
+        )
 
-        with open(os.path.join(proc_dir, 'comm')) as f:
-            name = f.read().strip()
+        name = read_proc_file(f'{proc_dir}/comm').decode().strip()
 
-        with open(os.path.join(proc_dir, 'cgroup')) as f:
-            container_id = extract_container_id(f.read())
+        container_id = extract_container_id(
+            read_proc_file(f'{proc_dir}/cgroup').decode()
+        )
 
-        with open(os.path.join(proc_dir, 'loginuid')) as f:
-            loginuid = int(f.read())
+        loginuid = int(read_proc_file(f'{proc_dir}/loginuid'))
 
         return Process(
             pid=pid,
@@ -206,28 +290,25 @@ class Process:
         if self.pid is not None:
             Event._diff_field(diff, 'pid', self.pid, other.pid)
 
-        Event._diff_field(diff, 'uid', self.uid, other.uid)
-        Event._diff_field(diff, 'gid', self.gid, other.gid)
-        Event._diff_field(diff, 'exe_path', self.exe_path, other.exe_path)
-        Event._diff_field(diff, 'args', self.args, other.args)
-        Event._diff_field(diff, 'name', self.name, other.name)
-        Event._diff_field(
-            diff,
-            'container_id',
-            self.container_id,
-            other.container_id,
-        )
-        Event._diff_field(diff, 'loginuid', self.loginuid, other.loginuid)
+        for name, attr in PROCESS_DIFF_FIELDS:
+            expected = getattr(self, attr)
+            actual = getattr(other, attr)
+            if expected != actual:
+                diff[name] = {'expected': expected, 'actual': actual}
 
         return diff if diff else None
 
     @override
     def __str__(self) -> str:
-        return (
-            f'Process(uid={self.uid}, gid={self.gid}, pid={self.pid}, '
-            f'exe_path={self.exe_path}, args={self.args}, '
-            f'name={self.name}, container_id={self.container_id}, '
-            f'loginuid={self.loginuid})'
+        return PROCESS_FMT % (
+            self._uid,
+            self._gid,
+            self._pid,
+            self._exe_path,
+            self._args,
+            self._name,
+            self._container_id,
+            self._loginuid,
         )
 
 
@@ -237,6 +318,21 @@ class Event:
     event type and a file.
     """
 
+    __slots__ = (
+        '_acl_entries',
+        '_acl_type',
+        '_file',
+        '_host_path',
+        '_mode',
+        '_old_file',
+        '_old_host_path',
+        '_owner_gid',
+        '_owner_uid',
+        '_process',
+        '_type',
+        '_xattr_name',
+    )
+
     def __init__(
         self,
         process: Process,
@@ -254,13 +350,15 @@ class Event:
     ):
         self._type: EventType = event_type
         self._process: Process = process
-        self._file: str | Pattern[str] = file
-        self._host_path: str | Pattern[str] = host_path
+        self._file: str | Pattern[str] = intern_path(file)
+        self._host_path: str | Pattern[str] = intern_path(host_path)
         self._mode: int | None = mode
         self._owner_uid: int | None = owner_uid
         self._owner_gid: int | None = owner_gid
-        self._old_file: str | Pattern[str] | None = old_file
-        self._old_host_path: str | Pattern[str] | None = old_host_path
+        self._old_file: str | Pattern[str] | None = intern_path(old_file)
+        self._old_host_path: str | Pattern[str] | None = intern_path(
+            old_host_path
+        )
         self._xattr_name: str | None = xattr_name
         self._acl_type: int | None = acl_type
         self._acl_entries: list[dict] | None = acl_entries
@@ -386,42 +484,30 @@ class Event:
                 diff, 'old_host_path', self.old_host_path, other.old_host_path
             )
 
-        if self.event_type == EventType.PERMISSION:
-            Event._diff_field(diff, 'mode', self.mode, other.mode)
-        elif self.event_type == EventType.OWNERSHIP:
-            Event._diff_field(
-                diff, 'owner_uid', self.owner_uid, other.owner_uid
-            )
-            Event._diff_field(
-                diff, 'owner_gid', self.owner_gid, other.owner_gid
-            )
-        elif self.event_type in (EventType.XATTR_SET, EventType.XATTR_REMOVE):
-            Event._diff_field(
-                diff, 'xattr_name', self.xattr_name, other.xattr_name
-            )
-        elif self.event_type == EventType.ACL:
+        for name, attr in EVENT_DIFF_FIELDS.get(self.event_type, ()):
+            expected = getattr(self, attr)
+            actual = getattr(other, attr)
+            if expected != actual:
+                diff[name] = {'expected': expected, 'actual': actual}
+
+        # ACL entries are only compared when the test specifies them
+        if self.event_type == EventType.ACL and self.acl_entries is not None:
             Event._diff_field(
                 diff,
-                'acl_type',
-                self.acl_type,
-                other.acl_type,
+                'acl_entries',
+                self.acl_entries,
+                other.acl_entries,
             )
-            if self.acl_entries is not None:
-                Event._diff_field(
-                    diff,
-                    'acl_entries',
-                    self.acl_entries,
-                    other.acl_entries,
-                )
 
         return diff if diff else None
 
     @override
     def __str__(self) -> str:
-        s = (
-            f'Event(event_type={self.event_type.name}, '
-            f'process={self.process}, file="{self.file}", '
-            f'host_path="{self.host_path}"'
+        s = EVENT_FMT % (
+            self._type.name,
+            self._process,
+            self._file,
+            self._host_path,
         )
 
         if self.event_type == EventType.PERMISSION:
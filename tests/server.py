@@ -1,14 +1,14 @@
 from __future__ import annotations
 
 import json
+import logging
 from abc import ABC, abstractmethod
-from collections import deque
 from collections.abc import Iterable
 from concurrent import futures
 from http.server import BaseHTTPRequestHandler, HTTPServer
+from queue import Empty, SimpleQueue
 from threading import Event as ThreadingEvent
 from threading import Thread
-from time import sleep
 from typing import TYPE_CHECKING, Any
 
 import grpc
@@ -38,6 +38,8 @@ if TYPE_CHECKING:
     from opentelemetry.proto.common.v1.common_pb2 import AnyValue, KeyValue
     from opentelemetry.proto.logs.v1.logs_pb2 import LogRecord
 
+logger = logging.getLogger(__name__)
+
 EVENT_TYPE_MAP: dict[str, EventType] = {
     'open': EventType.OPEN,
     'creation': EventType.CREATION,
@@ -77,10 +79,10 @@ ACL_TYPE_MAP: dict[str, int] = {
 class EventServer(ABC):
     """Base class for event-receiving test servers."""
 
-    def __init__(self):
-        self.queue: deque[Event] = deque()
+    def __init__(self, executor: futures.Executor):
+        self.queue: SimpleQueue[Event] = SimpleQueue()
         self.running = ThreadingEvent()
-        self.executor = futures.ThreadPoolExecutor(max_workers=2)
+        self.executor = executor
 
     @property
     @abstractmethod
@@ -92,18 +94,27 @@ class EventServer(ABC):
     @abstractmethod
     def stop(self) -> None: ...
 
-    def get_next(self) -> Event | None:
+    def put(self, event: Event):
+        """Add an event to the queue and wake up any waiter."""
+        self.queue.put(event)
+
+    def get_next(self, timeout: float | None = None) -> Event | None:
         """
         Retrieve and remove the next event from the queue.
-        Returns None if the queue is empty.
+
+        Blocks for up to timeout seconds waiting for an event, returns
+        None if the queue is still empty after that.
         """
-        if self.is_empty():
+        try:
+            if timeout is None:
+                return self.queue.get_nowait()
+            return self.queue.get(timeout=timeout)
+        except Empty:
             return None
-        return self.queue.popleft()
 
     def is_empty(self) -> bool:
         """Check if the internal queue of events is empty."""
-        return len(self.queue) == 0
+        return self.queue.empty()
 
     def is_running(self) -> bool:
         """Check if the server is currently running."""
@@ -116,21 +127,25 @@ class EventServer(ABC):
         skip_oneof_names: frozenset[EventType],
         cancel: ThreadingEvent,
     ):
+        # Index of the next expected event, cheaper than popping the
+        # head of the list on every match.
+        pending = 0
         while self.is_running() and not cancel.is_set():
-            msg = self.get_next()
+            # Wake up as soon as an event arrives, the timeout only
+            # bounds how long it takes to notice a cancellation.
+            msg = self.get_next(timeout=0.5)
             if msg is None:
-                sleep(0.5)
                 continue
 
-            print(f'Got event: {msg}')
+            logger.debug('Got event: %s', msg)
 
             if msg.event_type in skip_oneof_names:
                 continue
 
-            diff = events[0].diff(msg)
+            diff = events[pending].diff(msg)
             if diff is None:
-                events.pop(0)
-                if len(events) == 0:
+                pending += 1
+                if pending == len(events):
                     return
             elif strict:
                 raise ValueError(json.dumps(diff, indent=4, default=str))
@@ -163,7 +178,8 @@ class EventServer(ABC):
                 else (EVENT_TYPE_MAP[key],)
             )
         )
-        print('Waiting for events:', *events, sep='\n')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Waiting for events:\n%s', '\n'.join(map(str, events)))
         cancel = ThreadingEvent()
         fs = self.executor.submit(
             self._wait_events,
@@ -185,9 +201,12 @@ class GrpcServer(
 ):
     """gRPC server for the File Activity Service."""
 
-    def __init__(self):
-        super().__init__()
-        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    def __init__(self, executor: futures.Executor):
+        super().__init__(executor)
+        # Each Communicate stream holds a worker for as long as fact stays
+        # connected, leave room for a new stream to come in while a
+        # stale one is still being torn down, e.g. on reconnects.
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=8))
 
     @property
     def output_mode(self) -> str:
@@ -197,10 +216,9 @@ class GrpcServer(
     def _translate(msg: FileActivity) -> Event | None:
         """Translate a FileActivity protobuf message into an Event."""
         oneof = msg.WhichOneof('file')
-        if oneof is None or oneof not in EVENT_TYPE_MAP:
+        if oneof is None or (event_type := EVENT_TYPE_MAP.get(oneof)) is None:
             return None
 
-        event_type = EVENT_TYPE_MAP[oneof]
         field = getattr(msg, oneof)
 
         proc = msg.process
@@ -263,7 +281,7 @@ class GrpcServer(
         for req in request_iterator:
             event = self._translate(req)
             if event is not None:
-                self.queue.append(event)
+                self.put(event)
 
     def serve(self, addr: str = '0.0.0.0:9999'):
         """Start the gRPC server on the given address."""
@@ -284,8 +302,8 @@ class GrpcServer(
 class OtlpServer(EventServer):
     """HTTP server that receives OTLP/HTTP binary protobuf log exports."""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, executor: futures.Executor):
+        super().__init__(executor)
         self._httpd: HTTPServer | None = None
         self._thread: Thread | None = None
 
@@ -342,11 +360,9 @@ class OtlpServer(EventServer):
         file_data = attrs.get('file', {})
         event_type_str = file_data.get('event_type', '')
 
-        if event_type_str not in EVENT_TYPE_MAP:
+        if (event_type := EVENT_TYPE_MAP.get(event_type_str)) is None:
             return None
 
-        event_type = EVENT_TYPE_MAP[event_type_str]
-
         proc_data = attrs.get('process', {})
         args_list = proc_data.get('args', [])
         args = (
@@ -422,7 +438,7 @@ class OtlpServer(EventServer):
                         for record in scope_logs.log_records:
                             event = OtlpServer._translate(record)
                             if event is not None:
-                                parent.queue.append(event)
+                                parent.put(event)
 
                 response = ExportLogsServiceResponse()
                 response_bytes = response.SerializeToString()
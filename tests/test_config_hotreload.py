@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from concurrent import futures
 from concurrent.futures import TimeoutError as FuturesTimeoutError
 from time import sleep
 
@@ -11,6 +12,7 @@ import yaml
 
 from event import Event, EventType, Process
 from server import EventServer, GrpcServer
+from utils import YamlDumper
 
 DEFAULT_URL = 'http://127.0.0.1:9000'
 
@@ -27,7 +29,7 @@ def reload_config(
     delay: float = 0.5,
 ):
     with open(file, 'w') as f:
-        yaml.dump(config, f)
+        yaml.dump(config, f, Dumper=YamlDumper)
     fact.kill('SIGHUP')
     sleep(delay)
 
@@ -94,12 +96,12 @@ ALTERNATE_PORT = '9998'
 
 
 @pytest.fixture
-def alternate_server():
+def alternate_server(executor: futures.Executor):
     """
     Fixture to start and stop a GrpcServer on an alternate
     address.
     """
-    s = GrpcServer()
+    s = GrpcServer(executor)
     s.serve(f'0.0.0.0:{ALTERNATE_PORT}')
     yield s
     s.stop()
@@ -7,6 +7,14 @@ import docker.models.containers
 import docker.models.images
 import pytest
 
+# Run editor tests on a bind mounted directory and on a directory in the
+# container's overlayfs, the expected events are the same for both.
+EDITOR_DIRS = pytest.mark.parametrize(
+    'test_dir',
+    ['/mounted', '/container-dir'],
+    ids=['mounted', 'ovfs'],
+)
+
 
 def get_vi_test_file(dir: str):
     return os.path.join(dir, '4913')
@@ -22,24 +30,34 @@ def build_editor_image(docker_client: docker.DockerClient):
     return image
 
 
+# Remove everything the editors leave behind, so the next test using the
+# same container starts from a clean slate.
+CLEANUP_CMD = (
+    "sh -c 'find /mounted /container-dir -mindepth 1 -delete; "
+    "rm -rf /root/.viminfo /root/.local/state'"
+)
+
+
 def run_editor_container(
     image: str,
+    name: str,
     docker_client: docker.DockerClient,
-    ignored_dir: str,
+    tmp_path_factory: pytest.TempPathFactory,
 ):
     container = docker_client.containers.run(
         image,
         detach=True,
         tty=True,
-        name='editors',
+        name=name,
         volumes={
-            ignored_dir: {
+            str(tmp_path_factory.mktemp(name)): {
                 'bind': '/mounted',
                 'mode': 'z',
             },
         },
+        # Created by docker in the container's rootfs, see test_container
+        working_dir='/container-dir',
     )
-    container.exec_run('mkdir /container-dir')
 
     yield container
 
@@ -47,20 +65,57 @@ def run_editor_container(
     container.remove()
 
 
-@pytest.fixture
-def vi_container(docker_client: docker.DockerClient, ignored_dir: str):
+def clean_editor_container(container: docker.models.containers.Container):
+    """
+    Hand the shared container to a single test and clean it up after.
+
+    The cleanup runs while the fact instance of the test is still up, so
+    the events it triggers end up in that test's server and are dropped
+    along with it.
+    """
+    yield container
+    container.exec_run(CLEANUP_CMD)
+
+
+@pytest.fixture(scope='module')
+def shared_vi_container(
+    docker_client: docker.DockerClient,
+    tmp_path_factory: pytest.TempPathFactory,
+):
+    """
+    Container for vi based tests, started once per test module.
+    """
     yield from run_editor_container(
         'quay.io/fedora/fedora:43',
+        'vi',
         docker_client,
-        ignored_dir,
+        tmp_path_factory,
     )
 
 
 @pytest.fixture
-def editor_container(
+def vi_container(shared_vi_container: docker.models.containers.Container):
+    yield from clean_editor_container(shared_vi_container)
+
+
+@pytest.fixture(scope='module')
+def shared_editor_container(
     build_editor_image: docker.models.images.Image,
     docker_client: docker.DockerClient,
-    ignored_dir: str,
+    tmp_path_factory: pytest.TempPathFactory,
 ):
+    """
+    Container with vim and neovim installed, started once per test
+    module.
+    """
     image = build_editor_image.tags[0]
-    yield from run_editor_container(image, docker_client, ignored_dir)
+    yield from run_editor_container(
+        image, 'editors', docker_client, tmp_path_factory
+    )
+
+
+@pytest.fixture
+def editor_container(
+    shared_editor_container: docker.models.containers.Container,
+):
+    yield from clean_editor_container(shared_editor_container)
@@ -1,239 +0,0 @@
-from __future__ import annotations
-
-import docker.models.containers
-
-from event import Event, EventType, Process
-from server import EventServer
-from test_editors.commons import get_vi_test_file
-
-
-def test_new_file(
-    editor_container: docker.models.containers.Container,
-    server: EventServer,
-):
-    assert editor_container.id is not None
-    fut = '/mounted/test.txt'
-    cmd = f"nvim {fut} '+:normal iThis is a test<CR>' -c x"
-
-    editor_container.exec_run(cmd)
-
-    process = Process.in_container(
-        exe_path='/usr/bin/nvim',
-        args=cmd,
-        name='nvim',
-        container_id=editor_container.id[:12],
-    )
-    events = [
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-    ]
-
-    server.wait_events(events, strict=True)
-
-
-def test_open_file(
-    editor_container: docker.models.containers.Container,
-    server: EventServer,
-):
-    assert editor_container.id is not None
-    fut = '/mounted/test.txt'
-    fut_backup = f'{fut}~'
-    cmd = f"nvim {fut} '+:normal iThis is a test<CR>' -c x"
-    container_id = editor_container.id[:12]
-
-    # We ensure the file exists before editing.
-    editor_container.exec_run(f'touch {fut}')
-    editor_container.exec_run(cmd)
-
-    touch = Process.in_container(
-        exe_path='/usr/bin/touch',
-        args=f'touch {fut}',
-        name='touch',
-        container_id=container_id,
-    )
-    nvim = Process.in_container(
-        exe_path='/usr/bin/nvim',
-        args=cmd,
-        name='nvim',
-        container_id=container_id,
-    )
-
-    vi_test_file = get_vi_test_file('/mounted')
-
-    events = [
-        Event(
-            process=touch,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=nvim,
-            event_type=EventType.CREATION,
-            file=vi_test_file,
-            host_path='',
-        ),
-        Event(
-            process=nvim,
-            event_type=EventType.OWNERSHIP,
-            file=vi_test_file,
-            host_path='',
-            owner_uid=0,
-            owner_gid=0,
-        ),
-        Event(
-            process=nvim,
-            event_type=EventType.UNLINK,
-            file=vi_test_file,
-            host_path='',
-        ),
-        Event(
-            process=nvim,
-            event_type=EventType.RENAME,
-            file=fut_backup,
-            host_path='',
-            old_file=fut,
-            old_host_path='',
-        ),
-        Event(
-            process=nvim,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=nvim,
-            event_type=EventType.PERMISSION,
-            file=fut,
-            host_path='',
-            mode=0o100644,
-        ),
-        Event(
-            process=nvim,
-            event_type=EventType.UNLINK,
-            file=fut_backup,
-            host_path='',
-        ),
-    ]
-
-    server.wait_events(events, strict=True)
-
-
-def test_new_file_ovfs(
-    editor_container: docker.models.containers.Container,
-    server: EventServer,
-):
-    assert editor_container.id is not None
-    fut = '/container-dir/test.txt'
-    cmd = f"nvim {fut} '+:normal iThis is a test<CR>' -c x"
-
-    editor_container.exec_run(cmd)
-
-    process = Process.in_container(
-        exe_path='/usr/bin/nvim',
-        args=cmd,
-        name='nvim',
-        container_id=editor_container.id[:12],
-    )
-    events = [
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-    ]
-
-    server.wait_events(events, strict=True)
-
-
-def test_open_file_ovfs(
-    editor_container: docker.models.containers.Container,
-    server: EventServer,
-):
-    assert editor_container.id is not None
-    fut = '/container-dir/test.txt'
-    fut_backup = f'{fut}~'
-    cmd = f"nvim {fut} '+:normal iThis is a test<CR>' -c x"
-    container_id = editor_container.id[:12]
-
-    # We ensure the file exists before editing.
-    editor_container.exec_run(f'touch {fut}')
-    editor_container.exec_run(cmd)
-
-    touch = Process.in_container(
-        exe_path='/usr/bin/touch',
-        args=f'touch {fut}',
-        name='touch',
-        container_id=container_id,
-    )
-    nvim = Process.in_container(
-        exe_path='/usr/bin/nvim',
-        args=cmd,
-        name='nvim',
-        container_id=container_id,
-    )
-
-    vi_test_file = get_vi_test_file('/container-dir')
-
-    events = [
-        Event(
-            process=touch,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=nvim,
-            event_type=EventType.CREATION,
-            file=vi_test_file,
-            host_path='',
-        ),
-        Event(
-            process=nvim,
-            event_type=EventType.OWNERSHIP,
-            file=vi_test_file,
-            host_path='',
-            owner_uid=0,
-            owner_gid=0,
-        ),
-        Event(
-            process=nvim,
-            event_type=EventType.UNLINK,
-            file=vi_test_file,
-            host_path='',
-        ),
-        Event(
-            process=nvim,
-            event_type=EventType.RENAME,
-            file=fut_backup,
-            host_path='',
-            old_file=fut,
-            old_host_path='',
-        ),
-        Event(
-            process=nvim,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=nvim,
-            event_type=EventType.PERMISSION,
-            file=fut,
-            host_path='',
-            mode=0o100644,
-        ),
-        Event(
-            process=nvim,
-            event_type=EventType.UNLINK,
-            file=fut_backup,
-            host_path='',
-        ),
-    ]
-
-    server.wait_events(events, strict=True)
@@ -6,84 +6,33 @@ import docker.models.containers
 
 from event import Event, EventType, Process
 from server import EventServer
+from test_editors.commons import EDITOR_DIRS
 
+# Temporary file sed -i writes the result to before renaming it over the
+# original, keyed on the directory the edited file is in.
+SED_TMP_FILE = {
+    '/mounted': re.compile(r'/mounted/sed[0-9A-Za-z]{6}\Z'),
+    '/container-dir': re.compile(r'/container-dir/sed[0-9A-Za-z]{6}\Z'),
+}
 
-def test_sed(
-    vi_container: docker.models.containers.Container,
-    server: EventServer,
-):
-    assert vi_container.id is not None
-    # File Under Test
-    fut = '/mounted/test.txt'
-    create_cmd = f'sh -c "echo \'This is a test\' > {fut}"'
-    sed_cmd = rf'sed -i -e "s/a test/not \\0/" {fut}'
-    container_id = vi_container.id[:12]
-
-    vi_container.exec_run(create_cmd)
-    vi_container.exec_run(sed_cmd)
-
-    shell = Process.in_container(
-        exe_path='/usr/bin/bash',
-        args=create_cmd,
-        name='sh',
-        container_id=container_id,
-    )
-    sed = Process.in_container(
-        exe_path='/usr/bin/sed',
-        args=sed_cmd,
-        name='sed',
-        container_id=container_id,
-    )
-
-    sed_tmp_file = re.compile(r'\/mounted\/sed[0-9a-zA-Z]{6}')
-
-    events = [
-        Event(
-            process=shell,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=sed,
-            event_type=EventType.CREATION,
-            file=sed_tmp_file,
-            host_path='',
-        ),
-        Event(
-            process=sed,
-            event_type=EventType.OWNERSHIP,
-            file=sed_tmp_file,
-            host_path='',
-            owner_uid=0,
-            owner_gid=0,
-        ),
-        Event(
-            process=sed,
-            event_type=EventType.RENAME,
-            file=fut,
-            host_path='',
-            old_file=sed_tmp_file,
-            old_host_path='',
-        ),
-    ]
 
-    server.wait_events(events, strict=True)
-
-
-def test_sed_ovfs(
+@EDITOR_DIRS
+def test_sed(
     vi_container: docker.models.containers.Container,
+    test_dir: str,
     server: EventServer,
 ):
     assert vi_container.id is not None
     # File Under Test
-    fut = '/container-dir/test.txt'
+    fut = f'{test_dir}/test.txt'
     create_cmd = f'sh -c "echo \'This is a test\' > {fut}"'
     sed_cmd = rf'sed -i -e "s/a test/not \\0/" {fut}'
     container_id = vi_container.id[:12]
 
+    # The file needs to exist before sed runs, there is no need to wait
+    # for sed itself, wait_events does that.
     vi_container.exec_run(create_cmd)
-    vi_container.exec_run(sed_cmd)
+    vi_container.exec_run(sed_cmd, detach=True)
 
     shell = Process.in_container(
         exe_path='/usr/bin/bash',
@@ -98,7 +47,7 @@ def test_sed_ovfs(
         container_id=container_id,
     )
 
-    sed_tmp_file = re.compile(r'\/container-dir\/sed[0-9a-zA-Z]{6}')
+    sed_tmp_file = SED_TMP_FILE[test_dir]
 
     events = [
         Event(
@@ -1,413 +0,0 @@
-from __future__ import annotations
-
-import docker.models.containers
-
-from event import Event, EventType, Process
-from server import EventServer
-from test_editors.commons import get_vi_test_file
-
-
-def test_new_file(
-    vi_container: docker.models.containers.Container,
-    server: EventServer,
-):
-    assert vi_container.id is not None
-    fut = '/mounted/test.txt'
-    swap_file = '/mounted/.test.txt.swp'
-    swx_file = '/mounted/.test.txt.swx'
-    exe = '/usr/bin/vi'
-
-    cmd = f"{exe} {fut} '+:normal iThis is a test<CR>' -c x"
-
-    vi_container.exec_run(cmd)
-
-    process = Process.in_container(
-        exe_path=exe,
-        args=cmd,
-        name='vi',
-        container_id=vi_container.id[:12],
-    )
-
-    events = [
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=swx_file,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.UNLINK,
-            file=swx_file,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
-    ]
-
-    server.wait_events(events, strict=True)
-
-
-def test_new_file_ovfs(
-    vi_container: docker.models.containers.Container,
-    server: EventServer,
-):
-    assert vi_container.id is not None
-    fut = '/container-dir/test.txt'
-    swap_file = '/container-dir/.test.txt.swp'
-    swx_file = '/container-dir/.test.txt.swx'
-    exe = '/usr/bin/vi'
-
-    cmd = f"{exe} {fut} '+:normal iThis is a test<CR>' -c x"
-
-    vi_container.exec_run(cmd)
-
-    process = Process.in_container(
-        exe_path=exe,
-        args=cmd,
-        name='vi',
-        container_id=vi_container.id[:12],
-    )
-
-    events = [
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=swx_file,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.UNLINK,
-            file=swx_file,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
-    ]
-
-    server.wait_events(events, strict=True)
-
-
-def test_open_file(
-    vi_container: docker.models.containers.Container,
-    server: EventServer,
-):
-    assert vi_container.id is not None
-    fut = '/mounted/test.txt'
-    fut_backup = f'{fut}~'
-    swap_file = '/mounted/.test.txt.swp'
-    swx_file = '/mounted/.test.txt.swx'
-    vi_test_file = get_vi_test_file('/mounted')
-    exe = '/usr/bin/vi'
-    container_id = vi_container.id[:12]
-
-    cmd = f"{exe} {fut} '+:normal iThis is a test<CR>' -c x"
-
-    # We ensure the file exists before editing.
-    vi_container.exec_run(f'touch {fut}')
-    vi_container.exec_run(cmd)
-
-    touch_process = Process.in_container(
-        exe_path='/usr/bin/touch',
-        args=f'touch {fut}',
-        name='touch',
-        container_id=container_id,
-    )
-    vi_process = Process.in_container(
-        exe_path=exe,
-        args=cmd,
-        name='vi',
-        container_id=container_id,
-    )
-
-    events = [
-        Event(
-            process=touch_process,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=swx_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=swx_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.PERMISSION,
-            file=swap_file,
-            host_path='',
-            mode=0o644,
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=vi_test_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.OWNERSHIP,
-            file=vi_test_file,
-            host_path='',
-            owner_uid=0,
-            owner_gid=0,
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=vi_test_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.RENAME,
-            file=fut_backup,
-            host_path='',
-            old_file=fut,
-            old_host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.PERMISSION,
-            file=fut,
-            host_path='',
-            mode=0o100644,
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=fut_backup,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
-    ]
-
-    server.wait_events(events, strict=True)
-
-
-def test_open_file_ovfs(
-    vi_container: docker.models.containers.Container,
-    server: EventServer,
-):
-    assert vi_container.id is not None
-    fut = '/container-dir/test.txt'
-    fut_backup = f'{fut}~'
-    swap_file = '/container-dir/.test.txt.swp'
-    swx_file = '/container-dir/.test.txt.swx'
-    vi_test_file = get_vi_test_file('/container-dir')
-    exe = '/usr/bin/vi'
-    container_id = vi_container.id[:12]
-
-    cmd = f"{exe} {fut} '+:normal iThis is a test<CR>' -c x"
-
-    # We ensure the file exists before editing.
-    vi_container.exec_run(f'touch {fut}')
-    vi_container.exec_run(cmd)
-
-    touch_process = Process.in_container(
-        exe_path='/usr/bin/touch',
-        args=f'touch {fut}',
-        name='touch',
-        container_id=container_id,
-    )
-    vi_process = Process.in_container(
-        exe_path=exe,
-        args=cmd,
-        name='vi',
-        container_id=container_id,
-    )
-
-    events = [
-        Event(
-            process=touch_process,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=swx_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=swx_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.PERMISSION,
-            file=swap_file,
-            host_path='',
-            mode=0o644,
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=vi_test_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.OWNERSHIP,
-            file=vi_test_file,
-            host_path='',
-            owner_uid=0,
-            owner_gid=0,
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=vi_test_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.RENAME,
-            file=fut_backup,
-            host_path='',
-            old_file=fut,
-            old_host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.PERMISSION,
-            file=fut,
-            host_path='',
-            mode=0o100644,
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=fut_backup,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
-    ]
-
-    server.wait_events(events, strict=True)
@@ -1,32 +1,53 @@
 from __future__ import annotations
 
-import docker.models.containers
+from typing import NamedTuple
+
+import pytest
 
 from event import Event, EventType, Process
 from server import EventServer
-from test_editors.commons import get_vi_test_file
+from test_editors.commons import EDITOR_DIRS, get_vi_test_file
 
 
-def test_new_file(
-    editor_container: docker.models.containers.Container,
-    server: EventServer,
-):
-    assert editor_container.id is not None
-    fut = '/mounted/test.txt'
-    swap_file = '/mounted/.test.txt.swp'
-    swx_file = '/mounted/.test.txt.swx'
+class Editor(NamedTuple):
+    """
+    A vi-like editor under test.
 
-    cmd = f"vim {fut} '+:normal iThis is a test<CR>' -c x"
+    Args:
+        cmd: The program name used on the command line.
+        exe_path: The path to the binary fact reports.
+        container: Name of the fixture providing a container with the
+            editor installed.
+        swap: Whether the editor uses a swap file next to the edited
+            file. neovim keeps them in its state directory instead.
+    """
 
-    editor_container.exec_run(cmd)
+    cmd: str
+    exe_path: str
+    container: str
+    swap: bool
 
-    process = Process.in_container(
-        exe_path='/usr/bin/vim',
-        args=cmd,
-        name='vim',
-        container_id=editor_container.id[:12],
-    )
-    events = [
+
+EDITORS = pytest.mark.parametrize(
+    'editor',
+    [
+        Editor('/usr/bin/vi', '/usr/bin/vi', 'vi_container', True),
+        Editor('vim', '/usr/bin/vim', 'editor_container', True),
+        Editor('nvim', '/usr/bin/nvim', 'editor_container', False),
+    ],
+    ids=['vi', 'vim', 'nvim'],
+)
+
+
+def swap_events(process: Process, fut: str) -> list[Event]:
+    """
+    Events vi and vim trigger while setting up the swap file for fut.
+    """
+    test_dir, name = fut.rsplit('/', 1)
+    swap_file = f'{test_dir}/.{name}.swp'
+    swx_file = f'{test_dir}/.{name}.swx'
+
+    return [
         Event(
             process=process,
             event_type=EventType.CREATION,
@@ -57,107 +78,77 @@ def test_new_file(
             file=swap_file,
             host_path='',
         ),
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
     ]
 
-    server.wait_events(events, strict=True)
-
 
-def test_new_file_ovfs(
-    editor_container: docker.models.containers.Container,
+@EDITORS
+@EDITOR_DIRS
+def test_new_file(
+    request: pytest.FixtureRequest,
+    editor: Editor,
+    test_dir: str,
     server: EventServer,
 ):
-    assert editor_container.id is not None
-    fut = '/container-dir/test.txt'
-    swap_file = '/container-dir/.test.txt.swp'
-    swx_file = '/container-dir/.test.txt.swx'
+    container = request.getfixturevalue(editor.container)
+    assert container.id is not None
+    fut = f'{test_dir}/test.txt'
+    swap_file = f'{test_dir}/.test.txt.swp'
 
-    cmd = f"vim {fut} '+:normal iThis is a test<CR>' -c x"
+    cmd = f"{editor.cmd} {fut} '+:normal iThis is a test<CR>' -c x"
 
-    editor_container.exec_run(cmd)
+    container.exec_run(cmd, detach=True)
 
     process = Process.in_container(
-        exe_path='/usr/bin/vim',
+        exe_path=editor.exe_path,
         args=cmd,
-        name='vim',
-        container_id=editor_container.id[:12],
+        name=editor.exe_path.rsplit('/', 1)[-1],
+        container_id=container.id[:12],
     )
-    events = [
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=swx_file,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.UNLINK,
-            file=swx_file,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=swap_file,
-            host_path='',
-        ),
+
+    events = swap_events(process, fut) if editor.swap else []
+    events.append(
         Event(
             process=process,
             event_type=EventType.CREATION,
             file=fut,
             host_path='',
-        ),
-        Event(
-            process=process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
-    ]
+        )
+    )
+    if editor.swap:
+        events.append(
+            Event(
+                process=process,
+                event_type=EventType.UNLINK,
+                file=swap_file,
+                host_path='',
+            )
+        )
 
     server.wait_events(events, strict=True)
 
 
+@EDITORS
+@EDITOR_DIRS
 def test_open_file(
-    editor_container: docker.models.containers.Container,
+    request: pytest.FixtureRequest,
+    editor: Editor,
+    test_dir: str,
     server: EventServer,
 ):
-    assert editor_container.id is not None
-    fut = '/mounted/test.txt'
+    container = request.getfixturevalue(editor.container)
+    assert container.id is not None
+    fut = f'{test_dir}/test.txt'
     fut_backup = f'{fut}~'
-    swap_file = '/mounted/.test.txt.swp'
-    swx_file = '/mounted/.test.txt.swx'
-    vi_test_file = get_vi_test_file('/mounted')
-    container_id = editor_container.id[:12]
+    swap_file = f'{test_dir}/.test.txt.swp'
+    vi_test_file = get_vi_test_file(test_dir)
+    container_id = container.id[:12]
 
-    cmd = f"vim {fut} '+:normal iThis is a test<CR>' -c x"
+    cmd = f"{editor.cmd} {fut} '+:normal iThis is a test<CR>' -c x"
 
-    # We ensure the file exists before editing.
-    editor_container.exec_run(f'touch {fut}')
-    editor_container.exec_run(cmd)
+    # We ensure the file exists before editing. Both commands go
+    # through a single exec, touch and the editor still run as their own
+    # processes.
+    container.exec_run(['sh', '-c', f'touch {fut} && {cmd}'], detach=True)
 
     touch_process = Process.in_container(
         exe_path='/usr/bin/touch',
@@ -166,9 +157,9 @@ def test_open_file(
         container_id=container_id,
     )
     vi_process = Process.in_container(
-        exe_path='/usr/bin/vim',
+        exe_path=editor.exe_path,
         args=cmd,
-        name='vim',
+        name=editor.exe_path.rsplit('/', 1)[-1],
         container_id=container_id,
     )
 
@@ -179,229 +170,80 @@ def test_open_file(
             file=fut,
             host_path='',
         ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=swx_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=swx_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.PERMISSION,
-            file=swap_file,
-            host_path='',
-            mode=0o644,
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=vi_test_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.OWNERSHIP,
-            file=vi_test_file,
-            host_path='',
-            owner_uid=0,
-            owner_gid=0,
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=vi_test_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.RENAME,
-            file=fut_backup,
-            host_path='',
-            old_file=fut,
-            old_host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.PERMISSION,
-            file=fut,
-            host_path='',
-            mode=0o100644,
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=fut_backup,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
     ]
 
-    server.wait_events(events, strict=True)
-
-
-def test_open_file_ovfs(
-    editor_container: docker.models.containers.Container,
-    server: EventServer,
-):
-    assert editor_container.id is not None
-    fut = '/container-dir/test.txt'
-    fut_backup = f'{fut}~'
-    swap_file = '/container-dir/.test.txt.swp'
-    swx_file = '/container-dir/.test.txt.swx'
-    vi_test_file = get_vi_test_file('/container-dir')
-    container_id = editor_container.id[:12]
-
-    cmd = f"vim {fut} '+:normal iThis is a test<CR>' -c x"
-
-    # We ensure the file exists before editing.
-    editor_container.exec_run(f'touch {fut}')
-    editor_container.exec_run(cmd)
-
-    touch_process = Process.in_container(
-        exe_path='/usr/bin/touch',
-        args=f'touch {fut}',
-        name='touch',
-        container_id=container_id,
-    )
-    vi_process = Process.in_container(
-        exe_path='/usr/bin/vim',
-        args=cmd,
-        name='vim',
-        container_id=container_id,
+    if editor.swap:
+        events.extend(swap_events(vi_process, fut))
+        events.append(
+            Event(
+                process=vi_process,
+                event_type=EventType.PERMISSION,
+                file=swap_file,
+                host_path='',
+                mode=0o644,
+            )
+        )
+
+    events.extend(
+        [
+            Event(
+                process=vi_process,
+                event_type=EventType.CREATION,
+                file=vi_test_file,
+                host_path='',
+            ),
+            Event(
+                process=vi_process,
+                event_type=EventType.OWNERSHIP,
+                file=vi_test_file,
+                host_path='',
+                owner_uid=0,
+                owner_gid=0,
+            ),
+            Event(
+                process=vi_process,
+                event_type=EventType.UNLINK,
+                file=vi_test_file,
+                host_path='',
+            ),
+            Event(
+                process=vi_process,
+                event_type=EventType.RENAME,
+                file=fut_backup,
+                host_path='',
+                old_file=fut,
+                old_host_path='',
+            ),
+            Event(
+                process=vi_process,
+                event_type=EventType.CREATION,
+                file=fut,
+                host_path='',
+            ),
+            Event(
+                process=vi_process,
+                event_type=EventType.PERMISSION,
+                file=fut,
+                host_path='',
+                mode=0o100644,
+            ),
+            Event(
+                process=vi_process,
+                event_type=EventType.UNLINK,
+                file=fut_backup,
+                host_path='',
+            ),
+        ]
     )
 
-    events = [
-        Event(
-            process=touch_process,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=swx_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=swx_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=swap_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.PERMISSION,
-            file=swap_file,
-            host_path='',
-            mode=0o644,
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=vi_test_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.OWNERSHIP,
-            file=vi_test_file,
-            host_path='',
-            owner_uid=0,
-            owner_gid=0,
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=vi_test_file,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.RENAME,
-            file=fut_backup,
-            host_path='',
-            old_file=fut,
-            old_host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.PERMISSION,
-            file=fut,
-            host_path='',
-            mode=0o100644,
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=fut_backup,
-            host_path='',
-        ),
-        Event(
-            process=vi_process,
-            event_type=EventType.UNLINK,
-            file=swap_file,
-            host_path='',
-        ),
-    ]
+    if editor.swap:
+        events.append(
+            Event(
+                process=vi_process,
+                event_type=EventType.UNLINK,
+                file=swap_file,
+                host_path='',
+            )
+        )
 
     server.wait_events(events, strict=True)
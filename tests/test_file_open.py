@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import multiprocessing as mp
-import os
 from multiprocessing.synchronize import Event as MpEvent
 
 import docker.models.containers
@@ -9,7 +8,7 @@ import pytest
 
 from event import Event, EventType, Process
 from server import EventServer
-from utils import join_path_with_filename, path_to_string
+from utils import join_path_with_filename, path_to_string, write_file
 
 
 @pytest.mark.parametrize(
@@ -40,8 +39,7 @@ def test_open(
     # File Under Test
     fut = join_path_with_filename(monitored_dir, filename)
 
-    with open(fut, 'w') as f:
-        f.write('This is a test')
+    write_file(fut)
 
     # Convert fut to string for the Event, replacing invalid UTF-8 with U+FFFD
     fut = path_to_string(fut)
@@ -66,22 +64,21 @@ def test_multiple(monitored_dir: str, server: EventServer):
         server: The server instance to communicate with.
         filenames: List of filenames to create (includes UTF-8 test cases).
     """
-    events = []
     process = Process.from_proc()
-    # File Under Test
-    for i in range(3):
-        fut = os.path.join(monitored_dir, f'{i}.txt')
-        with open(fut, 'w') as f:
-            f.write('This is a test')
-
-        events.append(
-            Event(
-                process=process,
-                event_type=EventType.CREATION,
-                file=fut,
-                host_path=fut,
-            ),
+    # Files Under Test
+    futs = [f'{monitored_dir}/{i}.txt' for i in range(3)]
+    events = [
+        Event(
+            process=process,
+            event_type=EventType.CREATION,
+            file=fut,
+            host_path=fut,
         )
+        for fut in futs
+    ]
+
+    for fut in futs:
+        write_file(fut)
 
     server.wait_events(events)
 
@@ -95,19 +92,17 @@ def test_multiple_access(test_file: str, server: EventServer):
         monitored_dir: Temporary directory path for creating the test file.
         server: The server instance to communicate with.
     """
-    events = []
-    for _i in range(3):
-        with open(test_file, 'a+') as f:
-            f.write('This is a test')
-
-        events.append(
-            Event(
-                process=Process.from_proc(),
-                file=test_file,
-                host_path=test_file,
-                event_type=EventType.OPEN,
-            ),
-        )
+    # Every access triggers the same event, Event.diff doesn't modify
+    # it so a single instance can be expected repeatedly.
+    event = Event(
+        process=Process.from_proc(),
+        file=test_file,
+        host_path=test_file,
+        event_type=EventType.OPEN,
+    )
+    events = [event] * 3
+    for _ in events:
+        write_file(test_file, append=True)
 
     server.wait_events(events)
 
@@ -125,13 +120,11 @@ def test_ignored(test_file: str, ignored_dir: str, server: EventServer):
     p = Process.from_proc()
 
     # Ignored file, must not show up in the server
-    ignored_file = os.path.join(ignored_dir, 'test.txt')
-    with open(ignored_file, 'w') as f:
-        f.write('This is to be ignored')
+    ignored_file = f'{ignored_dir}/test.txt'
+    write_file(ignored_file, 'This is to be ignored')
 
     # File Under Test
-    with open(test_file, 'w') as f:
-        f.write('This is a test')
+    write_file(test_file)
 
     e = Event(
         process=p,
@@ -144,10 +137,8 @@ def test_ignored(test_file: str, ignored_dir: str, server: EventServer):
 
 
 def do_test(fut: str, stop_event: MpEvent):
-    with open(fut, 'w') as f:
-        f.write('This is a test')
-    with open(fut, 'a') as f:
-        f.write('This is also a test')
+    write_file(fut)
+    write_file(fut, 'This is also a test', append=True)
 
     # Wait for test to be done
     stop_event.wait()
@@ -164,7 +155,7 @@ def test_external_process(monitored_dir: str, server: EventServer):
     """
 
     # File Under Test
-    fut = os.path.join(monitored_dir, 'test2.txt')
+    fut = f'{monitored_dir}/test2.txt'
     stop_event = mp.Event()
     proc = mp.Process(target=do_test, args=(fut, stop_event))
     proc.start()
@@ -190,72 +181,54 @@ def test_external_process(monitored_dir: str, server: EventServer):
         proc.join(1)
 
 
-def test_overlay(
-    test_container: docker.models.containers.Container,
-    server: EventServer,
-):
-    assert test_container.id is not None
-    # File Under Test
-    fut = '/container-dir/test.txt'
-
-    # Create the exec and an equivalent event that it will trigger
-    test_container.exec_run(f'touch {fut}')
-
-    process = Process.in_container(
-        exe_path='/usr/bin/touch',
-        args=f'touch {fut}',
-        name='touch',
-        container_id=test_container.id[:12],
-    )
-    events = [
-        Event(
-            process=process,
-            event_type=EventType.CREATION,
-            file=fut,
-            host_path='',
+@pytest.mark.parametrize(
+    ('fut', 'event_type', 'on_host'),
+    [
+        pytest.param(
+            '/container-dir/test.txt',
+            EventType.CREATION,
+            False,
+            id='overlay',
         ),
-    ]
-
-    server.wait_events(events)
-
-
-def test_mounted_dir(
-    test_container: docker.models.containers.Container,
-    ignored_dir: str,
-    server: EventServer,
-):
-    assert test_container.id is not None
-    # File Under Test
-    fut = '/mounted/test.txt'
-
-    # Create the exec and an equivalent event that it will trigger
-    test_container.exec_run(f'touch {fut}')
-
-    process = Process.in_container(
-        exe_path='/usr/bin/touch',
-        args=f'touch {fut}',
-        name='touch',
-        container_id=test_container.id[:12],
-    )
-    # ignored_dir is not monitored, so host_path should be blank
-    event = Event(
-        process=process,
-        event_type=EventType.CREATION,
-        file=fut,
-        host_path='',
-    )
-
-    server.wait_events([event])
-
-
-def test_unmonitored_mounted_dir(
+        # ignored_dir is not monitored, so host_path should be blank
+        pytest.param(
+            '/mounted/test.txt',
+            EventType.CREATION,
+            False,
+            id='mounted_dir',
+        ),
+        # The container path is not monitored, but test_file on the host
+        # it is mounted from is.
+        pytest.param(
+            '/unmonitored/test.txt',
+            EventType.OPEN,
+            True,
+            id='unmonitored_mounted_dir',
+        ),
+    ],
+)
+def test_container_touch(
     test_container: docker.models.containers.Container,
     test_file: str,
     server: EventServer,
+    fut: str,
+    event_type: EventType,
+    on_host: bool,
 ):
+    """
+    Tests touching a file from inside a container and verifies that the
+    event reports the path as seen by the container and, when known,
+    on the host.
+
+    Args:
+        test_container: Container to run the touch command in.
+        test_file: Temporary file backing /unmonitored/test.txt.
+        server: The server instance to communicate with.
+        fut: Path of the file to touch inside the container.
+        event_type: The type of event the touch triggers.
+        on_host: Whether fact resolves the host path of the file.
+    """
     assert test_container.id is not None
-    # File Under Test
-    fut = '/unmonitored/test.txt'
 
     # Create the exec and an equivalent event that it will trigger
     test_container.exec_run(f'touch {fut}')
@@ -268,9 +241,9 @@ def test_unmonitored_mounted_dir(
     )
     event = Event(
         process=process,
-        event_type=EventType.OPEN,
+        event_type=event_type,
         file=fut,
-        host_path=test_file,
+        host_path=test_file if on_host else '',
     )
 
     server.wait_events([event])
@@ -12,7 +12,7 @@ from event import Event, EventType, Process
 from server import EventServer
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def build_self_deleter(docker_client: docker.DockerClient):
     image, _ = docker_client.images.build(
         path='containers/self-deleter',
@@ -51,8 +51,9 @@ def test_chown(
     touch_cmd = f'touch {fut_quoted}'
     chown_cmd = f'chown {TEST_UID}:{TEST_GID} {fut_quoted}'
 
-    test_container.exec_run(touch_cmd)
-    test_container.exec_run(chown_cmd)
+    # A single exec for both commands, the shell still runs touch and
+    # chown as their own processes with the same arguments.
+    test_container.exec_run(['sh', '-c', f'{touch_cmd} && {chown_cmd}'])
 
     touch = Process.in_container(
         exe_path='/usr/bin/touch',
@@ -100,14 +101,14 @@ def test_multiple(
     """
     assert test_container.id is not None
     events = []
+    cmds = []
 
     # File Under Test
     for i in range(3):
         fut = f'/container-dir/{i}.txt'
         touch_cmd = f'touch {fut}'
         chown_cmd = f'chown {TEST_UID}:{TEST_GID} {fut}'
-        test_container.exec_run(touch_cmd)
-        test_container.exec_run(chown_cmd)
+        cmds.extend([touch_cmd, chown_cmd])
 
         touch = Process.in_container(
             exe_path='/usr/bin/touch',
@@ -141,6 +142,8 @@ def test_multiple(
             ],
         )
 
+    test_container.exec_run(['sh', '-c', ' && '.join(cmds)])
+
     server.wait_events(events)
 
 
@@ -165,10 +168,13 @@ def test_ignored(
     monitored_touch_cmd = f'touch {monitored_file}'
     monitored_chown_cmd = f'chown {TEST_UID}:{TEST_GID} {monitored_file}'
 
-    test_container.exec_run(ignored_touch_cmd)
-    test_container.exec_run(ignored_chown_cmd)
-    test_container.exec_run(monitored_touch_cmd)
-    test_container.exec_run(monitored_chown_cmd)
+    cmds = [
+        ignored_touch_cmd,
+        ignored_chown_cmd,
+        monitored_touch_cmd,
+        monitored_chown_cmd,
+    ]
+    test_container.exec_run(['sh', '-c', ' && '.join(cmds)])
 
     reported_touch = Process.in_container(
         exe_path='/usr/bin/touch',
@@ -220,14 +226,12 @@ def test_no_change(
     touch_cmd = f'touch {fut}'
     chown_cmd = f'chown {TEST_UID}:{TEST_GID} {fut}'
 
-    # Create the file
-    test_container.exec_run(touch_cmd)
-
-    # First chown to TEST_UID:TEST_GID - this should trigger an event
-    test_container.exec_run(chown_cmd)
-
-    # Second chown to the same UID/GID - this should ALSO trigger an event
-    test_container.exec_run(chown_cmd)
+    # Create the file, then chown it to TEST_UID:TEST_GID twice. The
+    # second chown doesn't change anything but should ALSO trigger an
+    # event.
+    test_container.exec_run(
+        ['sh', '-c', f'{touch_cmd} && {chown_cmd} && {chown_cmd}']
+    )
 
     touch = Process.in_container(
         exe_path='/usr/bin/touch',
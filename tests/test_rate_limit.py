@@ -11,6 +11,7 @@ import yaml
 
 from event import Event, EventType, Process
 from server import EventServer
+from utils import YamlDumper
 
 
 @pytest.fixture
@@ -26,7 +27,7 @@ def rate_limited_config(
     config, config_file = fact_config
     config['rate_limit'] = 10
     with open(config_file, 'w') as f:
-        yaml.dump(config, f)
+        yaml.dump(config, f, Dumper=YamlDumper)
 
     fact.kill('SIGHUP')
     sleep(0.1)
@@ -9,6 +9,7 @@ import yaml
 
 from event import Event, EventType, Process
 from server import EventServer
+from utils import YamlDumper
 
 
 @pytest.fixture
@@ -24,7 +25,7 @@ def wildcard_config(
         f'{monitored_dir}/**/test-*.log',
     ]
     with open(config_file, 'w') as f:
-        yaml.dump(config, f)
+        yaml.dump(config, f, Dumper=YamlDumper)
 
     # reload the config
     fact.kill('SIGHUP')
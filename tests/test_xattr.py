@@ -12,9 +12,12 @@ from utils import join_path_with_filename, path_to_string
 
 
 def _xattr_supported() -> bool:
-    """Check whether the filesystem under cwd supports user xattrs."""
+    """
+    Check whether the filesystem holding the pytest temporary
+    directories supports user xattrs.
+    """
     try:
-        fd, path = tempfile.mkstemp(dir=os.getcwd())
+        fd, path = tempfile.mkstemp()
         try:
             os.setxattr(path, 'user.test', b'probe')
             os.removexattr(path, 'user.test')
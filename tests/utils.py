@@ -4,6 +4,11 @@ import os
 import re
 
 import requests
+import yaml
+
+# Use the libyaml based emitter when available, it is much faster than
+# the pure python one.
+YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
 
 
 def join_path_with_filename(directory: str, filename: str | bytes):
@@ -26,6 +31,33 @@ def join_path_with_filename(directory: str, filename: str | bytes):
         return os.path.join(directory, filename)
 
 
+def write_file(
+    path: str | bytes,
+    data: str | bytes = b'This is a test',
+    append: bool = False,
+):
+    """
+    Write data to a file with a single open, write and close.
+
+    This skips the buffering and text decoding layers of the builtin
+    open(), which only add overhead when writing a short string once.
+
+    Args:
+        path: Path of the file to write (str or bytes)
+        data: Contents to write, str is encoded as UTF-8
+        append: Append to the file instead of truncating it
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    flags = os.O_WRONLY | os.O_CREAT
+    flags |= os.O_APPEND if append else os.O_TRUNC
+    fd = os.open(path, flags, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
 def path_to_string(path: str | bytes):
     """
     Convert a filesystem path to string, replacing invalid UTF-8 with U+FFFD.